@@ -8,14 +8,31 @@ Param(
   [bool] $warnAsError = $true,
   [bool] $nodeReuse = $true,
   [switch][Alias('r')] $restore,
+  [switch] $forceRestore,
   [switch][Alias('b')] $build,
   [switch] $rebuild,
   [switch][Alias('t')] $test,
+  [switch] $integrationTest,
+  [switch] $performanceTest,
+  [string] $performanceBaseline = $null,
+  [string] $performanceThreshold = $null,
+  [string] $performanceAllocationThreshold = $null,
+  [switch] $performanceWarnOnly,
+  [switch] $updatePerformanceBaseline,
   [switch] $pack,
   [switch] $publish,
   [switch] $clean,
   [switch][Alias('pb')] $productBuild,
   [string] $pushNupkgsLocal = $null,
+  [switch] $validateConsumers,
+  [string] $consumerJobs = $null,
+  [string] $upgradeProjects = $null,
+  [string] $upgradeMode = $null,
+  [string] $upgradeTargetGodotVersion = $null,
+  [switch] $upgradeEnablePreview,
+  [string] $upgradeJobs = $null,
+  [switch] $sampleProcesses,
+  [string] $sampleInterval = $null,
   [switch][Alias('bl')] $binaryLog,
   [switch][Alias('nobl')] $excludeCIBinarylog,
   [switch] $ci,
@@ -40,19 +57,46 @@ function Print-Usage() {
 
   Write-Host "Actions:"
   Write-Host "  -restore                Restore dependencies (short: -r)"
+  Write-Host "                          Skipped when the restore inputs haven't changed since the last successful restore"
+  Write-Host "  -forceRestore           Restore dependencies even if the restore inputs haven't changed"
   Write-Host "  -build                  Build solution (short: -b)"
   Write-Host "  -rebuild                Rebuild solution"
   Write-Host "  -test                   Run all unit tests in the solution (short: -t)"
+  Write-Host "  -integrationTest        Run all integration tests in the solution"
+  Write-Host "  -performanceTest        Run all performance tests in the solution and compare them with the baseline"
+  Write-Host "                          If -configuration is not set explicitly, will also set it to 'Release'"
   Write-Host "  -pack                   Package build outputs into NuGet packages"
   Write-Host "  -clean                  Clean the solution"
   Write-Host "  -publish                Publish artifacts (e.g. packages, symbols)"
   Write-Host "  -productBuild           Build the solution in the way it will be built for distribution (short: -pb)"
   Write-Host "                          Will additionally trigger the following actions: -restore, -build, -pack"
   Write-Host "                          If -configuration is not set explicitly, will also set it to 'Release'"
+  Write-Host "  -validateConsumers      Build the consumer projects in the 'samples' directory against the produced packages"
+  Write-Host "                          Will additionally trigger the following actions: -productBuild"
+  Write-Host "  -upgradeProjects <value>"
+  Write-Host "                          Run the upgrade assistant over every Godot project found in the specified directory"
+  Write-Host "                          Only builds the upgrade assistant, other build actions are ignored"
   Write-Host ""
 
   Write-Host "Advanced settings:"
   Write-Host "  -projects <value>       Semi-colon delimited list of sln/proj's to build. Globbing is supported (*.sln)"
+  Write-Host "  -performanceBaseline <value>"
+  Write-Host "                          Path to the performance baseline file (default: eng/PerformanceBaseline.json)"
+  Write-Host "  -performanceThreshold <value>"
+  Write-Host "                          Maximum allowed increase of the mean time of a benchmark in percent (default: 10)"
+  Write-Host "  -performanceAllocationThreshold <value>"
+  Write-Host "                          Maximum allowed increase of the allocated bytes of a benchmark in percent (default: 10)"
+  Write-Host "  -performanceWarnOnly    Report performance regressions as warnings instead of failing the build"
+  Write-Host "  -updatePerformanceBaseline"
+  Write-Host "                          Replace the performance baseline with the results of the current run"
+  Write-Host "  -consumerJobs <value>   Maximum number of consumer projects built in parallel (default: all)"
+  Write-Host "  -upgradeMode <value>    Upgrade assistant command to run: 'analyze' (default) or 'upgrade'"
+  Write-Host "  -upgradeTargetGodotVersion <value>"
+  Write-Host "                          Godot version to upgrade the projects to (default: latest version known by the upgrade assistant)"
+  Write-Host "  -upgradeEnablePreview   Enable the Godot .NET bindings preview when upgrading"
+  Write-Host "  -upgradeJobs <value>    Maximum number of Godot projects upgraded in parallel (default: 4)"
+  Write-Host "  -sampleProcesses        Sample the resource usage of the build child processes (Linux only)"
+  Write-Host "  -sampleInterval <value> Interval between process samples in seconds (default: 1, minimum: 0.1)"
   Write-Host "  -ci                     Set when running on CI server"
   Write-Host "  -excludeCIBinarylog     Don't output binary log (short: -nobl)"
   Write-Host "  -nodeReuse <value>      Sets nodereuse msbuild parameter ('true' or 'false')"
@@ -82,6 +126,9 @@ if ($binaryLog) {
 if ($restore) {
   $_args += @("--restore")
 }
+if ($forceRestore) {
+  $_args += @("--forceRestore")
+}
 if ($build) {
   $_args += @("--build")
 }
@@ -91,6 +138,12 @@ if ($rebuild) {
 if ($test) {
   $_args += @("--test")
 }
+if ($integrationTest) {
+  $_args += @("--integrationTest")
+}
+if ($performanceTest) {
+  $_args += @("--performanceTest")
+}
 if ($pack) {
   $_args += @("--pack")
 }
@@ -109,6 +162,48 @@ if ($pushNupkgsLocal) {
 if ($projects) {
   $_args += @("--projects=$projects")
 }
+if ($performanceBaseline) {
+  $_args += @("--performanceBaseline=$performanceBaseline")
+}
+if ($performanceThreshold) {
+  $_args += @("--performanceThreshold=$performanceThreshold")
+}
+if ($performanceAllocationThreshold) {
+  $_args += @("--performanceAllocationThreshold=$performanceAllocationThreshold")
+}
+if ($performanceWarnOnly) {
+  $_args += @("--performanceWarnOnly")
+}
+if ($updatePerformanceBaseline) {
+  $_args += @("--updatePerformanceBaseline")
+}
+if ($validateConsumers) {
+  $_args += @("--validateConsumers")
+}
+if ($consumerJobs) {
+  $_args += @("--consumerJobs=$consumerJobs")
+}
+if ($upgradeProjects) {
+  $_args += @("--upgradeProjects=$upgradeProjects")
+}
+if ($upgradeMode) {
+  $_args += @("--upgradeMode=$upgradeMode")
+}
+if ($upgradeTargetGodotVersion) {
+  $_args += @("--upgradeTargetGodotVersion=$upgradeTargetGodotVersion")
+}
+if ($upgradeEnablePreview) {
+  $_args += @("--upgradeEnablePreview")
+}
+if ($upgradeJobs) {
+  $_args += @("--upgradeJobs=$upgradeJobs")
+}
+if ($sampleProcesses) {
+  $_args += @("--sampleProcesses")
+}
+if ($sampleInterval) {
+  $_args += @("--sampleInterval=$sampleInterval")
+}
 if ($ci) {
   $_args += @("--ci")
 }
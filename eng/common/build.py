@@ -11,6 +11,8 @@ I couldn't find a way to achieve the same behavior with Python directly.
 """
 
 import os
+import re
+import glob
 import shutil
 import sys
 import signal
@@ -18,8 +20,15 @@ import argparse
 from argparse import Namespace
 from typing import List
 from typing import Tuple
+from typing import Union
 
 import tools
+import build_lock
+import performance
+import upgrade_assistant
+import consumer_validation
+import restore_fingerprint
+import process_sampler
 
 
 # Silence traceback on Ctrl-C.
@@ -39,17 +48,34 @@ def _parse_args() -> Tuple[Namespace, List[str]]:
 
     # Actions.
     parser.add_argument("--restore", "-r", action="store_true", default=None)
+    parser.add_argument("--forceRestore", action="store_true", default=None)
     parser.add_argument("--build", "-b", action="store_true", default=None)
     parser.add_argument("--rebuild", action="store_true", default=None)
     parser.add_argument("--test", "-t", action="store_true", default=None)
+    parser.add_argument("--integrationTest", action="store_true", default=None)
+    parser.add_argument("--performanceTest", action="store_true", default=None)
     parser.add_argument("--pack", action="store_true", default=None)
     parser.add_argument("--publish", action="store_true", default=None)
     parser.add_argument("--clean", action="store_true", default=None)
     parser.add_argument("--productBuild", "-pb", action="store_true", default=None)
     parser.add_argument("--pushNupkgsLocal")
+    parser.add_argument("--validateConsumers", action="store_true", default=None)
+    parser.add_argument("--upgradeProjects")
 
     # Advanced settings.
     parser.add_argument("--projects")
+    parser.add_argument("--performanceBaseline")
+    parser.add_argument("--performanceThreshold", type=float)
+    parser.add_argument("--performanceAllocationThreshold", type=float)
+    parser.add_argument("--performanceWarnOnly", action="store_true", default=None)
+    parser.add_argument("--updatePerformanceBaseline", action="store_true", default=None)
+    parser.add_argument("--consumerJobs", type=_job_count)
+    parser.add_argument("--upgradeMode", choices=["analyze", "upgrade"])
+    parser.add_argument("--upgradeTargetGodotVersion")
+    parser.add_argument("--upgradeEnablePreview", action="store_true", default=None)
+    parser.add_argument("--upgradeJobs", type=int)
+    parser.add_argument("--sampleProcesses", action="store_true", default=None)
+    parser.add_argument("--sampleInterval", type=_sample_interval)
     parser.add_argument("--ci", action="store_true", default=None)
     parser.add_argument("--excludeCIBinarylog", "-nobl", action="store_true", default=None)
     parser.add_argument("--nodeReuse", type=lambda x: (str(x).lower() == "true"))
@@ -61,6 +87,21 @@ def _parse_args() -> Tuple[Namespace, List[str]]:
     return parser.parse_known_args()
 
 
+def _job_count(value: str) -> int:
+    jobs = int(value)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return jobs
+
+
+# Sampling walks every process in '/proc', shorter intervals would add noticeable overhead to the build.
+def _sample_interval(value: str) -> float:
+    interval = float(value)
+    if interval < process_sampler.min_interval:
+        raise argparse.ArgumentTypeError(f"must be at least {process_sampler.min_interval} seconds")
+    return interval
+
+
 def build(unknown_args: List[str]):
     toolset = tools.initialize_toolset()
 
@@ -76,20 +117,89 @@ def build(unknown_args: List[str]):
     if tools.binary_log:
         build_args.append(f'/bl:"{tools.log_dir}/Build.binlog"')
 
+    # Skip the restore if its inputs haven't changed since the last successful restore with the same arguments.
+    # The inputs are hashed before building so files modified during the build aren't recorded as restored.
+    restore = tools.restore
+    if restore:
+        restore_inputs = restore_fingerprint.compute_inputs_hash([*tools.projects, str(tools.product_build), str(tools.pack), *unknown_args])
+        if not tools.force_restore and restore_fingerprint.is_up_to_date(restore_inputs):
+            print("Restore inputs are unchanged since the last restore, skipping restore. Use '--forceRestore' to restore anyway.", flush=True)
+            restore = False
+
     build_args += [
         f"/p:Configuration={tools.configuration}",
         f"/p:RepoRoot={tools.repo_root}",
-        f"/p:Restore={tools.restore}",
+        f"/p:Restore={restore}",
         f"/p:Build={tools.build}",
         f"/p:Rebuild={tools.rebuild}",
         f"/p:Test={tools.test}",
+        f"/p:IntegrationTest={tools.integration_test}",
+        f"/p:PerformanceTest={tools.performance_test}",
         f"/p:Pack={tools.pack}",
         f"/p:Publish={tools.publish}",
         f"/p:ProductBuild={tools.product_build}",
     ]
 
+    if tools.performance_test:
+        # Only compare the reports produced by this run, reports left by benchmark projects
+        # that weren't run (e.g.: filtered with '--projects', renamed or removed) would be stale.
+        shutil.rmtree(os.path.join(tools.test_results_dir, "Performance"), ignore_errors=True)
+
     tools.msbuild([toolset, *build_args, *unknown_args])
 
+    if restore:
+        restore_fingerprint.save(restore_inputs)
+
+    if tools.performance_test:
+        performance.compare_with_baseline()
+
+    if tools.validate_consumers:
+        consumer_validation.validate_consumers()
+
+
+def upgrade_projects(unknown_args: List[str]):
+    toolset = tools.initialize_toolset()
+
+    # Build the upgrade assistant before running it over the Godot projects.
+    cli_project = os.path.join(tools.repo_root, "src", "Godot.UpgradeAssistant.Cli", "Godot.UpgradeAssistant.Cli.csproj")
+
+    build_args = [
+        f"/p:Projects={cli_project}",
+        f"/p:Configuration={tools.configuration}",
+        f"/p:RepoRoot={tools.repo_root}",
+        f"/p:Restore={tools.restore}",
+        "/p:Build=True",
+    ]
+
+    tools.msbuild([toolset, *build_args, *unknown_args])
+
+    cli_output_dir = os.path.join(tools.artifacts_dir, "bin", "Godot.UpgradeAssistant.Cli", tools.configuration)
+    cli_dlls = glob.glob(os.path.join(cli_output_dir, "*", "Godot.UpgradeAssistant.Cli.dll"))
+
+    # Output directories of previous target frameworks may still exist, use the one the project targets.
+    target_framework = _get_target_framework(cli_project)
+    if target_framework:
+        cli_dlls = [cli_dll for cli_dll in cli_dlls if os.path.basename(os.path.dirname(cli_dll)) == target_framework]
+
+    if not cli_dlls:
+        tools.pipeline_write_error("UpgradeAssistant", f"Unable to find the upgrade assistant in '{cli_output_dir}'.")
+        print(f"Unable to find the upgrade assistant in '{cli_output_dir}'.", flush=True)
+        exit(1)
+
+    if len(cli_dlls) > 1:
+        tools.pipeline_write_error("UpgradeAssistant", f"Found more than one build of the upgrade assistant in '{cli_output_dir}'.")
+        print(f"Found more than one build of the upgrade assistant in '{cli_output_dir}', clean the artifacts directory and try again.", flush=True)
+        exit(1)
+
+    upgrade_assistant.run_batch(cli_dlls[0])
+
+
+# Returns the target framework declared in the project file, or None if it's not declared there.
+def _get_target_framework(project: str) -> Union[str, None]:
+    with open(project, encoding="utf-8-sig") as f:
+        match = re.search(r"<TargetFramework>\s*([^<$;]+?)\s*</TargetFramework>", f.read())
+    return match.group(1) if match else None
+
 
 def clean():
     if os.path.exists(tools.artifacts_dir):
@@ -98,14 +208,29 @@ def clean():
     exit(0)
 
 
+def _run(args: Namespace, unknown_args: List[str]):
+    if args.clean:
+        clean()
+
+    sampler = process_sampler.start(tools.sample_interval) if tools.sample_processes else None
+    try:
+        if tools.upgrade_projects_root:
+            upgrade_projects(unknown_args)
+            return
+
+        build(unknown_args)
+    finally:
+        if sampler:
+            sampler.stop()
+
+
 def main():
     args, unknown_args = _parse_args()
     tools.init(args)
 
-    if args.clean:
-        clean()
-
-    build(unknown_args)
+    # Coordinate with other build invocations running in the same repository.
+    request = build_lock.create_request(args, unknown_args)
+    build_lock.run_exclusive(request, lambda: _run(args, unknown_args))
 
 
 if __name__ == "__main__":
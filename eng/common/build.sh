@@ -18,9 +18,14 @@ usage()
 
   echo "Actions:"
   echo "  --restore                  Restore dependencies (short: -r)"
+  echo "                             Skipped when the restore inputs haven't changed since the last successful restore"
+  echo "  --forceRestore             Restore dependencies even if the restore inputs haven't changed"
   echo "  --build                    Build solution (short: -b)"
   echo "  --rebuild                  Rebuild solution"
   echo "  --test                     Run all unit tests in the solution (short: -t)"
+  echo "  --integrationTest          Run all integration tests in the solution"
+  echo "  --performanceTest          Run all performance tests in the solution and compare them with the baseline"
+  echo "                             If --configuration is not set explicitly, will also set it to 'Release'"
   echo "  --pack                     Package build outputs into NuGet packages"
   echo "  --publish                  Publish artifacts (e.g. packages, symbols)"
   echo "  --clean                    Clean the solution"
@@ -29,10 +34,32 @@ usage()
   echo "                             If --configuration is not set explicitly, will also set it to 'Release'"
   echo "  --pushNupkgsLocal          Local NuGet feed directory to publish assets to"
   echo "                             Will additionally trigger the following actions: --publish"
+  echo "  --validateConsumers        Build the consumer projects in the 'samples' directory against the produced packages"
+  echo "                             Will additionally trigger the following actions: --productBuild"
+  echo "  --upgradeProjects <value>"
+  echo "                             Run the upgrade assistant over every Godot project found in the specified directory"
+  echo "                             Only builds the upgrade assistant, other build actions are ignored"
   echo ""
 
   echo "Advanced settings:"
   echo "  --projects <value>         Semi-colon delimited list of sln/proj's to build. Globbing is supported (*.sln)"
+  echo "  --performanceBaseline <value>"
+  echo "                             Path to the performance baseline file (default: eng/PerformanceBaseline.json)"
+  echo "  --performanceThreshold <value>"
+  echo "                             Maximum allowed increase of the mean time of a benchmark in percent (default: 10)"
+  echo "  --performanceAllocationThreshold <value>"
+  echo "                             Maximum allowed increase of the allocated bytes of a benchmark in percent (default: 10)"
+  echo "  --performanceWarnOnly      Report performance regressions as warnings instead of failing the build"
+  echo "  --updatePerformanceBaseline"
+  echo "                             Replace the performance baseline with the results of the current run"
+  echo "  --consumerJobs <value>     Maximum number of consumer projects built in parallel (default: all)"
+  echo "  --upgradeMode <value>      Upgrade assistant command to run: 'analyze' (default) or 'upgrade'"
+  echo "  --upgradeTargetGodotVersion <value>"
+  echo "                             Godot version to upgrade the projects to (default: latest version known by the upgrade assistant)"
+  echo "  --upgradeEnablePreview     Enable the Godot .NET bindings preview when upgrading"
+  echo "  --upgradeJobs <value>      Maximum number of Godot projects upgraded in parallel (default: 4)"
+  echo "  --sampleProcesses          Sample the resource usage of the build child processes (Linux only)"
+  echo "  --sampleInterval <value>   Interval between process samples in seconds (default: 1, minimum: 0.1)"
   echo "  --ci                       Set when running on CI server"
   echo "  --excludeCIBinarylog       Don't output binary log (short: -nobl)"
   echo "  --nodeReuse <value>        Sets nodereuse msbuild parameter ('true' or 'false')"
@@ -85,6 +112,9 @@ while [[ $# > 0 ]]; do
     -restore|-r)
       restore=true
       ;;
+    -forcerestore)
+      force_restore=true
+      ;;
     -build|-b)
       build=true
       ;;
@@ -107,6 +137,63 @@ while [[ $# > 0 ]]; do
     -test|-t)
       test=true
       ;;
+    -validateconsumers)
+      validate_consumers=true
+      ;;
+    -consumerjobs)
+      consumer_jobs=$2
+      shift
+      ;;
+    -upgradeprojects)
+      upgrade_projects=$2
+      shift
+      ;;
+    -upgrademode)
+      upgrade_mode=$2
+      shift
+      ;;
+    -upgradetargetgodotversion)
+      upgrade_target_godot_version=$2
+      shift
+      ;;
+    -upgradeenablepreview)
+      upgrade_enable_preview=true
+      ;;
+    -upgradejobs)
+      upgrade_jobs=$2
+      shift
+      ;;
+    -sampleprocesses)
+      sample_processes=true
+      ;;
+    -sampleinterval)
+      sample_interval=$2
+      shift
+      ;;
+    -integrationtest)
+      integration_test=true
+      ;;
+    -performancetest)
+      performance_test=true
+      ;;
+    -performancebaseline)
+      performance_baseline=$2
+      shift
+      ;;
+    -performancethreshold)
+      performance_threshold=$2
+      shift
+      ;;
+    -performanceallocationthreshold)
+      performance_allocation_threshold=$2
+      shift
+      ;;
+    -performancewarnonly)
+      performance_warn_only=true
+      ;;
+    -updateperformancebaseline)
+      update_performance_baseline=true
+      ;;
     -projects)
       projects=$2
       shift
@@ -144,6 +231,9 @@ fi
 if [[ -n "${restore:-}" ]]; then
   args+=("--restore")
 fi
+if [[ -n "${force_restore:-}" ]]; then
+  args+=("--forceRestore")
+fi
 if [[ -n "${build:-}" ]]; then
   args+=("--build")
 fi
@@ -153,6 +243,12 @@ fi
 if [[ -n "${test:-}" ]]; then
   args+=("--test")
 fi
+if [[ -n "${integration_test:-}" ]]; then
+  args+=("--integrationTest")
+fi
+if [[ -n "${performance_test:-}" ]]; then
+  args+=("--performanceTest")
+fi
 if [[ -n "${pack:-}" ]]; then
   args+=("--pack")
 fi
@@ -171,6 +267,48 @@ fi
 if [[ -n "${projects:-}" ]]; then
   args+=("--projects=$projects")
 fi
+if [[ -n "${performance_baseline:-}" ]]; then
+  args+=("--performanceBaseline=$performance_baseline")
+fi
+if [[ -n "${performance_threshold:-}" ]]; then
+  args+=("--performanceThreshold=$performance_threshold")
+fi
+if [[ -n "${performance_allocation_threshold:-}" ]]; then
+  args+=("--performanceAllocationThreshold=$performance_allocation_threshold")
+fi
+if [[ -n "${performance_warn_only:-}" ]]; then
+  args+=("--performanceWarnOnly")
+fi
+if [[ -n "${update_performance_baseline:-}" ]]; then
+  args+=("--updatePerformanceBaseline")
+fi
+if [[ -n "${validate_consumers:-}" ]]; then
+  args+=("--validateConsumers")
+fi
+if [[ -n "${consumer_jobs:-}" ]]; then
+  args+=("--consumerJobs=$consumer_jobs")
+fi
+if [[ -n "${upgrade_projects:-}" ]]; then
+  args+=("--upgradeProjects=$upgrade_projects")
+fi
+if [[ -n "${upgrade_mode:-}" ]]; then
+  args+=("--upgradeMode=$upgrade_mode")
+fi
+if [[ -n "${upgrade_target_godot_version:-}" ]]; then
+  args+=("--upgradeTargetGodotVersion=$upgrade_target_godot_version")
+fi
+if [[ -n "${upgrade_enable_preview:-}" ]]; then
+  args+=("--upgradeEnablePreview")
+fi
+if [[ -n "${upgrade_jobs:-}" ]]; then
+  args+=("--upgradeJobs=$upgrade_jobs")
+fi
+if [[ -n "${sample_processes:-}" ]]; then
+  args+=("--sampleProcesses")
+fi
+if [[ -n "${sample_interval:-}" ]]; then
+  args+=("--sampleInterval=$sample_interval")
+fi
 if [[ -n "${ci:-}" ]]; then
   args+=("--ci")
 fi
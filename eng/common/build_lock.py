@@ -0,0 +1,318 @@
+#!/usr/bin/python3
+
+import os
+import json
+import time
+import hashlib
+import uuid
+from argparse import Namespace
+from typing import Callable
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import tools
+
+
+# Interval (in seconds) between attempts to acquire a lock that is held by another process.
+_poll_interval: float = 0.5
+
+# Time (in seconds) after which a lock file that can't be read is considered stale
+# (i.e. its owner was killed while writing it or the disk was full).
+_unreadable_lock_timeout: float = 10.0
+
+
+class BuildRequest:
+    key: str
+    run_id: str
+    description: str
+
+    def __init__(self, key: str, description: str):
+        self.key = key
+        self.run_id = uuid.uuid4().hex
+        self.description = description
+
+
+class _LockOwner:
+    pid: int
+    key: str
+    run_id: str
+    description: str
+
+    def __init__(self, pid: int, key: str, run_id: str, description: str):
+        self.pid = pid
+        self.key = key
+        self.run_id = run_id
+        self.description = description
+
+
+# Settings shown in the description of the build that holds the lock.
+_described_actions: List[str] = [
+    "restore", "build", "rebuild", "test", "integration_test", "performance_test",
+    "pack", "publish", "product_build", "validate_consumers", "upgrade_projects_root",
+]
+
+
+# Creates the request that identifies the current build invocation.
+# Two invocations are considered identical when they were started from the same directory
+# with the same arguments, including the pass-thru MSBuild arguments. Every argument is
+# part of the key since any of them can change the result of the build.
+def create_request(args: Namespace, extra_args: List[str]) -> BuildRequest:
+    request = {
+        # Relative paths in the arguments are resolved from the working directory.
+        "cwd": os.getcwd(),
+        "args": vars(args),
+        "extra_args": extra_args,
+    }
+
+    key = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+    enabled_actions = [name for name in _described_actions if getattr(tools, name)]
+    description = f"{', '.join(enabled_actions) or 'restore'} ({tools.configuration})"
+
+    return BuildRequest(key, description)
+
+
+# Executes the action while holding the repository build lock.
+#
+# Only one build can run in the repository at the same time, other invocations wait until
+# the lock is released. If an identical request is already running, the invocation waits
+# for it to finish and reuses its exit code instead of building again.
+#
+# Terminates the script with the exit code of the build.
+def run_exclusive(request: BuildRequest, action: Callable[[], None]) -> None:
+    lock_dir = _get_lock_dir()
+    os.makedirs(lock_dir, exist_ok=True)
+
+    lock_file = os.path.join(lock_dir, "build.lock")
+
+    coalesced_run_id = _acquire(lock_file, request)
+    if coalesced_run_id:
+        exit_code = _read_result(lock_dir, request.key, coalesced_run_id)
+        if exit_code is not None:
+            print(f"Reusing the result of an identical build that finished with exit code {exit_code}.", flush=True)
+            exit(exit_code)
+
+        # The identical build didn't record a result (i.e. it was killed), so build it ourselves.
+        _acquire(lock_file, request, coalesce=False)
+
+    exit_code = 0
+    try:
+        action()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        exit_code = 1
+        raise
+    finally:
+        _write_result(lock_dir, request, exit_code)
+        _release(lock_file, request)
+
+    exit(exit_code)
+
+
+def _get_lock_dir() -> str:
+    # The lock can't live in the artifacts directory because it may be deleted by '--clean'.
+    return os.path.join(tools.tools_dir, "build-lock")
+
+
+# Acquires the lock, waiting for other builds to release it.
+# Returns the run id of an identical build if it was running when we started waiting
+# (and coalescing is allowed), otherwise returns None once the lock is ours.
+def _acquire(lock_file: str, request: BuildRequest, coalesce: bool = True) -> Union[str, None]:
+    content = json.dumps({
+        "pid": os.getpid(),
+        "key": request.key,
+        "run_id": request.run_id,
+        "description": request.description,
+    })
+
+    reported_owner_run_id = None
+    unreadable_lock = None
+    unreadable_since = 0.0
+
+    while True:
+        if _try_create(lock_file, content):
+            return None
+
+        owner = _read_owner(lock_file)
+        if owner is None:
+            # The lock was released between our attempt and the read, or it's still being written.
+            lock_id = _get_file_id(lock_file)
+            if lock_id is None:
+                continue
+
+            if lock_id != unreadable_lock:
+                unreadable_lock = lock_id
+                unreadable_since = time.monotonic()
+            elif time.monotonic() - unreadable_since > _unreadable_lock_timeout:
+                print("Recovering unreadable build lock.", flush=True)
+                _remove_if_unchanged(lock_file, lock_id)
+                unreadable_lock = None
+                continue
+
+            time.sleep(_poll_interval)
+            continue
+
+        unreadable_lock = None
+
+        if not _is_process_alive(owner.pid):
+            print(f"Recovering stale build lock left by process {owner.pid}.", flush=True)
+            _remove_if_owned(lock_file, owner.run_id)
+            continue
+
+        if coalesce and owner.key == request.key:
+            print(f"An identical build is already running (PID {owner.pid}), waiting for it to finish.", flush=True)
+            while _is_held_by(lock_file, owner):
+                time.sleep(_poll_interval)
+            return owner.run_id
+
+        if reported_owner_run_id != owner.run_id:
+            print(f"Another build is running (PID {owner.pid}: {owner.description}), waiting for it to finish.", flush=True)
+            reported_owner_run_id = owner.run_id
+
+        time.sleep(_poll_interval)
+
+
+# Atomically creates the lock file with the given content.
+# The content is written to a temporary file first and then hard-linked
+# to the lock path so other processes never observe a partially written lock.
+def _try_create(lock_file: str, content: str) -> bool:
+    temp_file = f"{lock_file}.{os.getpid()}.tmp"
+    with open(temp_file, "w") as f:
+        f.write(content)
+
+    try:
+        os.link(temp_file, lock_file)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        # The file system doesn't support hard links, create the lock file directly.
+        # Other processes may observe it partially written until the content is written.
+        return _try_create_exclusive(lock_file, content)
+    finally:
+        os.remove(temp_file)
+
+
+def _try_create_exclusive(lock_file: str, content: str) -> bool:
+    try:
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+
+    with os.fdopen(fd, "w") as f:
+        f.write(content)
+    return True
+
+
+def _read_owner(lock_file: str) -> Union[_LockOwner, None]:
+    try:
+        with open(lock_file) as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    try:
+        return _LockOwner(data["pid"], data["key"], data["run_id"], data.get("description", ""))
+    except (KeyError, TypeError):
+        return None
+
+
+# Returns a value that identifies the current version of the file, or None if it doesn't exist.
+def _get_file_id(path: str) -> Union[Tuple[int, int, int], None]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _is_held_by(lock_file: str, owner: _LockOwner) -> bool:
+    current_owner = _read_owner(lock_file)
+    if current_owner is None or current_owner.run_id != owner.run_id:
+        return False
+
+    return _is_process_alive(owner.pid)
+
+
+def _release(lock_file: str, request: BuildRequest) -> None:
+    _remove_if_owned(lock_file, request.run_id)
+
+
+def _remove_if_owned(lock_file: str, run_id: str) -> None:
+    owner = _read_owner(lock_file)
+    if owner is None or owner.run_id != run_id:
+        return
+
+    try:
+        os.remove(lock_file)
+    except FileNotFoundError:
+        pass
+
+
+# Removes the file only if it wasn't replaced or modified since it was identified.
+def _remove_if_unchanged(path: str, file_id: Tuple[int, int, int]) -> None:
+    if _get_file_id(path) != file_id:
+        return
+
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _get_result_file(lock_dir: str, key: str) -> str:
+    return os.path.join(lock_dir, f"{key}.result.json")
+
+
+def _write_result(lock_dir: str, request: BuildRequest, exit_code: int) -> None:
+    result_file = _get_result_file(lock_dir, request.key)
+    temp_file = f"{result_file}.{os.getpid()}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump({ "run_id": request.run_id, "exit_code": exit_code }, f)
+    os.replace(temp_file, result_file)
+
+
+def _read_result(lock_dir: str, key: str, run_id: str) -> Union[int, None]:
+    try:
+        with open(_get_result_file(lock_dir, key)) as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if data.get("run_id") != run_id:
+        return None
+
+    return data["exit_code"]
+
+
+def _is_process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user.
+        return True
+
+    return True
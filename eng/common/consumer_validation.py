@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+
+import os
+import re
+import glob
+import json
+import time
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+
+import tools
+
+
+# This regex separates the package id and the package version from the nupkg filename.
+_package_regex = re.compile(r"^(.*?)\.((?:\.?[0-9]+){3,}(?:[-a-zA-Z0-9]+?\.?)*)\.nupkg$")
+
+# Package that the consumer projects reference when building against the local feed.
+_consumer_package_id = "Godot"
+
+
+class ConsumerResult:
+    project: str
+    status: str
+    restore_duration: float
+    build_duration: float
+    log: str
+
+    def __init__(self, project: str, status: str, restore_duration: float = 0.0, build_duration: float = 0.0, log: str = ""):
+        self.project = project
+        self.status = status
+        self.restore_duration = restore_duration
+        self.build_duration = build_duration
+        self.log = log
+
+    def to_json(self) -> dict:
+        return {
+            "project": self.project,
+            "status": self.status,
+            "restore_duration": round(self.restore_duration, 3),
+            "build_duration": round(self.build_duration, 3),
+            "log": self.log,
+        }
+
+
+# Builds every consumer project under the 'samples' directory against the packages produced by the build.
+#
+# The packages are restored once into a shared package root, then each consumer is built in parallel
+# with its own isolated package root seeded by hardlinking the shared one. That way NuGet doesn't
+# need to extract the packages again and the consumers can't interfere with each other.
+#
+# Terminates the script if any consumer fails to build.
+def validate_consumers() -> None:
+    consumers = sorted(glob.glob(os.path.join(tools.repo_root, "samples", "**", "*.csproj"), recursive=True))
+    if not consumers:
+        print("No consumer projects found in the 'samples' directory.", flush=True)
+        return
+
+    feed_dir = tools.push_nupkgs_local or os.path.join(tools.artifacts_dir, "packages", tools.configuration, "Shipping")
+    package_versions = _get_package_versions(feed_dir)
+    if _consumer_package_id not in package_versions:
+        print(f"Unable to find the '{_consumer_package_id}' package in '{feed_dir}'.", flush=True)
+        tools.pipeline_write_error("ConsumerValidation", f"Unable to find the '{_consumer_package_id}' package in '{feed_dir}'.")
+        exit(1)
+
+    package_version = package_versions[_consumer_package_id]
+
+    stage_dir = os.path.join(tools.temp_dir, "ConsumerValidation")
+    shared_packages_dir = os.path.join(stage_dir, "packages")
+    os.makedirs(shared_packages_dir, exist_ok=True)
+
+    # Packages produced by the repo keep the same version between local builds,
+    # so remove them from the shared package root to ensure the new packages are used.
+    for package_id in package_versions:
+        shutil.rmtree(os.path.join(shared_packages_dir, package_id.lower()), ignore_errors=True)
+
+    print(f"Validating {len(consumers)} consumer projects against '{_consumer_package_id}' {package_version} from '{feed_dir}'.", flush=True)
+
+    common_args = [
+        f"/p:Configuration={tools.configuration}",
+        f"/p:RepoRoot={tools.repo_root}",
+        "/p:UseLocalGodotPackages=true",
+        f"/p:GodotPackageVersion={package_version}",
+        f"/p:RestoreAdditionalProjectSources={feed_dir}",
+    ]
+
+    # Restore every consumer into the shared package root, the packages are only extracted once.
+    restore_durations: Dict[str, float] = {}
+    restore_failures: Dict[str, str] = {}
+    for consumer in consumers:
+        name = _get_consumer_name(consumer)
+        log_file = os.path.join(tools.log_dir, f"ConsumerValidation-{name}-Restore.log")
+
+        start = time.monotonic()
+        exit_code = _run_msbuild(consumer, ["/t:Restore", *common_args, *_get_output_args(name)], shared_packages_dir, log_file)
+        restore_durations[consumer] = time.monotonic() - start
+        if exit_code != 0:
+            restore_failures[consumer] = log_file
+
+    def build_consumer(consumer: str) -> ConsumerResult:
+        name = _get_consumer_name(consumer)
+        restore_duration = restore_durations[consumer]
+        if consumer in restore_failures:
+            return ConsumerResult(consumer, "restore failed", restore_duration, log=restore_failures[consumer])
+
+        packages_dir = os.path.join(stage_dir, name, "packages")
+        log_file = os.path.join(tools.log_dir, f"ConsumerValidation-{name}.log")
+
+        start = time.monotonic()
+        _seed_packages(shared_packages_dir, packages_dir)
+        exit_code = _run_msbuild(consumer, ["/restore", "/t:Build", *common_args, *_get_output_args(name)], packages_dir, log_file)
+        build_duration = time.monotonic() - start
+
+        return ConsumerResult(consumer, "succeeded" if exit_code == 0 else "failed", restore_duration, build_duration, log_file)
+
+    jobs = tools.consumer_jobs or len(consumers)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(build_consumer, consumers))
+
+    _write_report(os.path.join(tools.log_dir, "ConsumerValidation.json"), package_version, feed_dir, results)
+
+    for result in results:
+        relative_path = os.path.relpath(result.project, tools.repo_root)
+        print(f"  [{result.status}] {relative_path} (restore: {result.restore_duration:.1f}s, build: {result.build_duration:.1f}s)", flush=True)
+
+    failed = [result for result in results if result.status != "succeeded"]
+    if failed:
+        for result in failed:
+            relative_path = os.path.relpath(result.project, tools.repo_root)
+            print(f"Consumer validation failed for '{relative_path}'. Check the log: {result.log}", flush=True)
+            tools.pipeline_write_error("ConsumerValidation", f"Consumer validation failed for '{relative_path}'.")
+        exit(1)
+
+    print(f"All {len(results)} consumer projects built successfully.", flush=True)
+
+
+# Returns the newest version of each package found in the feed directory, indexed by package id.
+def _get_package_versions(feed_dir: str) -> Dict[str, str]:
+    versions: Dict[str, str] = {}
+
+    package_files = glob.glob(os.path.join(feed_dir, "*.nupkg"))
+    for package_file in sorted(package_files, key=os.path.getmtime):
+        match = _package_regex.match(os.path.basename(package_file))
+        if match:
+            versions[match.group(1)] = match.group(2)
+
+    return versions
+
+
+def _get_consumer_name(consumer: str) -> str:
+    relative_path = os.path.relpath(os.path.dirname(consumer), os.path.join(tools.repo_root, "samples"))
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", relative_path)
+
+
+def _get_output_args(name: str) -> List[str]:
+    # Build in a separate output directory to avoid conflicting with the repository build of the samples.
+    return [f"/p:OutDirName=ConsumerValidation/{name}"]
+
+
+# Creates an isolated package root by hardlinking every file from the shared package root.
+# Falls back to copying when hardlinks are not supported (e.g.: different volumes).
+def _seed_packages(shared_packages_dir: str, packages_dir: str) -> None:
+    if os.path.exists(packages_dir):
+        shutil.rmtree(packages_dir)
+
+    def link_or_copy(src: str, dst: str) -> None:
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    shutil.copytree(shared_packages_dir, packages_dir, copy_function=link_or_copy)
+
+
+def _run_msbuild(project: str, args: List[str], packages_dir: str, log_file: str) -> int:
+    build_tool = tools.initialize_build_tool()
+
+    env = os.environ.copy()
+    env["NUGET_PACKAGES"] = packages_dir
+    # Node reuse would share MSBuild nodes (and their environment) between the consumers.
+    env["MSBUILDDISABLENODEREUSE"] = "1"
+
+    build_args = [
+        "/nologo",
+        "/nodeReuse:false",
+        f"/verbosity:{tools.verbosity}",
+        f"/p:ContinuousIntegrationBuild={tools.ci}",
+    ]
+
+    with open(log_file, "w") as log:
+        return subprocess.call([build_tool.tool, build_tool.command, project, *build_args, *args], env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def _write_report(report_file: str, package_version: str, feed_dir: str, results: List[ConsumerResult]) -> None:
+    data = {
+        "package_version": package_version,
+        "feed": feed_dir,
+        "consumers": [result.to_json() for result in results],
+    }
+
+    with open(report_file, "w") as f:
+        json.dump(data, f, indent=2)
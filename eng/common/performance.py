@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+
+import os
+import glob
+import json
+from typing import Dict
+from typing import List
+from typing import Union
+
+import tools
+
+
+class BenchmarkResult:
+    name: str
+    mean: float
+    allocated: Union[int, None]
+
+    def __init__(self, name: str, mean: float, allocated: Union[int, None] = None):
+        self.name = name
+        self.mean = mean
+        self.allocated = allocated
+
+
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __init__(self, name: str, metric: str, baseline: float, current: float):
+        self.name = name
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+
+    # Relative change in percent, or None if the baseline was zero.
+    @property
+    def change(self) -> Union[float, None]:
+        if self.baseline == 0:
+            return None
+        return (self.current - self.baseline) / self.baseline * 100
+
+    def __str__(self) -> str:
+        change = f"{self.change:.1f}%" if self.change is not None else "an unbounded amount"
+        return f"{self.name}: {self.metric} regressed by {change} ({self.baseline:g} -> {self.current:g})"
+
+
+# Collects the results of the performance tests, compares them with the baseline
+# and reports the benchmarks that regressed above the configured thresholds.
+# Terminates the script if there are regressions, unless they should only be reported as warnings.
+def compare_with_baseline() -> None:
+    results_dir = os.path.join(tools.test_results_dir, "Performance")
+    results = collect_results(results_dir)
+    if not results:
+        print(f"No performance test results were found in '{results_dir}'.", flush=True)
+        return
+
+    if tools.update_performance_baseline:
+        # Only part of the benchmarks may have run (e.g.: filtered with '--projects' or 'PerformanceTestFilter'),
+        # keep the baseline of the benchmarks that didn't run.
+        baseline = read_baseline(tools.performance_baseline) if os.path.exists(tools.performance_baseline) else {}
+        write_baseline(tools.performance_baseline, {**baseline, **results})
+        print(f"Performance baseline updated with {len(results)} benchmarks: {tools.performance_baseline}", flush=True)
+        return
+
+    if not os.path.exists(tools.performance_baseline):
+        print(f"Performance baseline not found, skipping comparison: {tools.performance_baseline}", flush=True)
+        print("Use '--updatePerformanceBaseline' to create it from the current results.", flush=True)
+        return
+
+    baseline = read_baseline(tools.performance_baseline)
+    regressions = find_regressions(baseline, results)
+
+    report_file = os.path.join(results_dir, "PerformanceComparison.json")
+    _write_report(report_file, baseline, results, regressions)
+
+    missing = [name for name in baseline if name not in results]
+    for name in missing:
+        print(f"Benchmark in the baseline was not executed: {name}", flush=True)
+
+    if not regressions:
+        print(f"No performance regressions found in {len(results)} benchmarks.", flush=True)
+        return
+
+    for regression in regressions:
+        message = str(regression)
+        print(message, flush=True)
+        if tools.performance_warn_only:
+            tools.pipeline_write_warning("PerformanceTest", message)
+        else:
+            tools.pipeline_write_error("PerformanceTest", message)
+
+    print(f"Found {len(regressions)} performance regressions. See '{report_file}' for details.", flush=True)
+    if not tools.performance_warn_only:
+        exit(1)
+
+
+# Reads the BenchmarkDotNet JSON reports found in the given directory.
+# Returns the results indexed by the full name of the benchmark.
+def collect_results(results_dir: str) -> Dict[str, BenchmarkResult]:
+    results: Dict[str, BenchmarkResult] = {}
+
+    report_files = glob.glob(os.path.join(results_dir, "**", "*-report*.json"), recursive=True)
+    for report_file in sorted(report_files):
+        with open(report_file, encoding="utf-8-sig") as f:
+            report = json.load(f)
+
+        for benchmark in report.get("Benchmarks", []):
+            statistics = benchmark.get("Statistics")
+            if not statistics:
+                # The benchmark failed to run, BenchmarkDotNet already reported the error.
+                continue
+
+            memory = benchmark.get("Memory") or {}
+            name = benchmark["FullName"]
+            results[name] = BenchmarkResult(name, statistics["Mean"], memory.get("BytesAllocatedPerOperation"))
+
+    return results
+
+
+def find_regressions(baseline: Dict[str, BenchmarkResult], results: Dict[str, BenchmarkResult]) -> List[Regression]:
+    regressions: List[Regression] = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        expected = baseline[name]
+
+        if _exceeds_threshold(expected.mean, result.mean, tools.performance_threshold):
+            regressions.append(Regression(name, "mean time (ns)", expected.mean, result.mean))
+
+        if expected.allocated is not None and result.allocated is not None:
+            if _exceeds_threshold(expected.allocated, result.allocated, tools.performance_allocation_threshold):
+                regressions.append(Regression(name, "allocated bytes/op", expected.allocated, result.allocated))
+
+    return regressions
+
+
+def _exceeds_threshold(baseline: float, current: float, threshold: float) -> bool:
+    if baseline == 0:
+        # Any increase from zero (i.e. allocations in an allocation-free benchmark) is a regression.
+        return current > 0
+
+    return (current - baseline) / baseline * 100 > threshold
+
+
+def read_baseline(baseline_file: str) -> Dict[str, BenchmarkResult]:
+    with open(baseline_file) as f:
+        data = json.load(f)
+
+    return {name: BenchmarkResult(name, value["mean"], value.get("allocated")) for name, value in data["benchmarks"].items()}
+
+
+def write_baseline(baseline_file: str, results: Dict[str, BenchmarkResult]) -> None:
+    data = {
+        "benchmarks": {name: _result_to_json(result) for name, result in sorted(results.items())},
+    }
+
+    with open(baseline_file, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def _result_to_json(result: BenchmarkResult) -> dict:
+    value: dict = { "mean": result.mean }
+    if result.allocated is not None:
+        value["allocated"] = result.allocated
+    return value
+
+
+def _write_report(report_file: str, baseline: Dict[str, BenchmarkResult], results: Dict[str, BenchmarkResult], regressions: List[Regression]) -> None:
+    data = {
+        "baseline": tools.performance_baseline,
+        "thresholds": {
+            "mean": tools.performance_threshold,
+            "allocated": tools.performance_allocation_threshold,
+        },
+        "benchmarks": {
+            name: {
+                "baseline": _result_to_json(baseline[name]) if name in baseline else None,
+                "current": _result_to_json(result),
+            } for name, result in sorted(results.items())
+        },
+        "regressions": [{
+            "name": regression.name,
+            "metric": regression.metric,
+            "baseline": regression.baseline,
+            "current": regression.current,
+            "change": regression.change,
+        } for regression in regressions],
+    }
+
+    with open(report_file, "w") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+
+import os
+import json
+import time
+import threading
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import tools
+
+
+# Minimum interval between samples, in seconds.
+min_interval: float = 0.1
+
+# Roles used to group the sampled processes in the summary, matched against the command line in order.
+_roles: List[Tuple[str, List[str]]] = [
+    ("compiler server", ["VBCSCompiler"]),
+    ("test host", ["testhost", "xunit.console", "vstest.console"]),
+    ("msbuild node", ["/nodemode:", "-nodemode:"]),
+    ("msbuild", ["MSBuild.dll", "msbuild"]),
+]
+
+
+class _ProcessInfo:
+    pid: int
+    start_time: int
+    role: str
+    cpu_ticks: int
+    peak_rss: int
+
+    def __init__(self, pid: int, start_time: int, role: str, cpu_ticks: int):
+        self.pid = pid
+        self.start_time = start_time
+        self.role = role
+        self.cpu_ticks = cpu_ticks
+        self.peak_rss = 0
+
+
+class _RoleSummary:
+    processes: int
+    peak_rss: int
+    peak_process_rss: int
+    peak_cpu: float
+    cpu_seconds: float
+
+    def __init__(self):
+        self.processes = 0
+        self.peak_rss = 0
+        self.peak_process_rss = 0
+        self.peak_cpu = 0.0
+        self.cpu_seconds = 0.0
+
+
+# Samples the resource usage of the child processes of the build script (MSBuild nodes,
+# the compiler server, test hosts, etc.) by reading '/proc' at a fixed interval.
+#
+# The samples are written to 'ProcessSamples.jsonl' in the log directory, one JSON object per line:
+#   {"type": "process", "pid", "ppid", "role", "cmdline"}   the first time a process is seen.
+#   {"t", "p", "c", "m", "r", "w"}                           a sample: time since the sampler started (seconds),
+#                                                            PID, CPU usage since the previous sample (percent
+#                                                            of one core), RSS (KiB), and bytes read and written.
+#
+# A summary of the peak memory and CPU usage by process role is printed and written
+# to 'ProcessSummary.json' when the sampler is stopped.
+class ProcessSampler:
+    interval: float
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ProcessSampler", daemon=True)
+        # Indexed by PID and start time, since PIDs can be reused during the build.
+        self._processes: Dict[Tuple[int, int], _ProcessInfo] = {}
+        self._summaries: Dict[str, _RoleSummary] = {}
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._samples_file = os.path.join(tools.log_dir, "ProcessSamples.jsonl")
+        self._summary_file = os.path.join(tools.log_dir, "ProcessSummary.json")
+
+    def start(self) -> None:
+        self._start_time = time.monotonic()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+        self._write_summary()
+
+    def _run(self) -> None:
+        with open(self._samples_file, "w") as f:
+            previous_time = time.monotonic()
+            while not self._stop_event.wait(self.interval):
+                now = time.monotonic()
+                self._sample(f, now - self._start_time, now - previous_time)
+                previous_time = now
+                f.flush()
+
+    def _sample(self, f, elapsed: float, delta: float) -> None:
+        role_rss: Dict[str, int] = {}
+        role_cpu: Dict[str, float] = {}
+
+        for pid, ppid in _get_descendants(os.getpid()):
+            stat = _read_stat(pid)
+            if stat is None:
+                # The process exited while we were sampling.
+                continue
+
+            cpu_ticks, rss_pages, start_time = stat
+            rss = rss_pages * self._page_size
+
+            process = self._processes.get((pid, start_time))
+            if process is None:
+                cmdline = _read_cmdline(pid)
+                process = _ProcessInfo(pid, start_time, _get_role(cmdline), 0)
+                self._processes[(pid, start_time)] = process
+                self._get_summary(process.role).processes += 1
+                f.write(json.dumps({ "type": "process", "pid": pid, "ppid": ppid, "role": process.role, "cmdline": cmdline }) + "\n")
+
+                # We don't know when the process started, so its CPU usage is reported from the next sample.
+                cpu = 0.0
+            else:
+                cpu = (cpu_ticks - process.cpu_ticks) / self._clock_ticks / delta * 100
+
+            summary = self._get_summary(process.role)
+            summary.cpu_seconds += (cpu_ticks - process.cpu_ticks) / self._clock_ticks
+            summary.peak_process_rss = max(summary.peak_process_rss, rss)
+            process.cpu_ticks = cpu_ticks
+            process.peak_rss = max(process.peak_rss, rss)
+
+            role_rss[process.role] = role_rss.get(process.role, 0) + rss
+            role_cpu[process.role] = role_cpu.get(process.role, 0.0) + cpu
+
+            read_bytes, write_bytes = _read_io(pid)
+            f.write(json.dumps({ "t": round(elapsed, 2), "p": pid, "c": round(cpu, 1), "m": rss // 1024, "r": read_bytes, "w": write_bytes }, separators=(",", ":")) + "\n")
+
+        for role, rss in role_rss.items():
+            summary = self._get_summary(role)
+            summary.peak_rss = max(summary.peak_rss, rss)
+            summary.peak_cpu = max(summary.peak_cpu, role_cpu[role])
+
+    def _get_summary(self, role: str) -> _RoleSummary:
+        if role not in self._summaries:
+            self._summaries[role] = _RoleSummary()
+        return self._summaries[role]
+
+    def _write_summary(self) -> None:
+        if not self._summaries:
+            return
+
+        data = {
+            role: {
+                "processes": summary.processes,
+                "peak_rss": summary.peak_rss,
+                "peak_process_rss": summary.peak_process_rss,
+                "peak_cpu": round(summary.peak_cpu, 1),
+                "cpu_seconds": round(summary.cpu_seconds, 2),
+            } for role, summary in sorted(self._summaries.items())
+        }
+
+        with open(self._summary_file, "w") as f:
+            json.dump(data, f, indent=2)
+
+        print("Process resource usage by role:", flush=True)
+        for role, summary in sorted(self._summaries.items(), key=lambda item: item[1].peak_rss, reverse=True):
+            print(f"  {role}: {summary.processes} processes, peak memory {_format_bytes(summary.peak_rss)} (single process {_format_bytes(summary.peak_process_rss)}), peak CPU {summary.peak_cpu:.0f}%, CPU time {summary.cpu_seconds:.1f}s", flush=True)
+        print(f"Process samples written to '{self._samples_file}'.", flush=True)
+
+
+# Starts sampling the child processes of the build script.
+# Returns None if sampling is not supported on this platform.
+def start(interval: float) -> Union[ProcessSampler, None]:
+    if not os.path.isdir("/proc/self"):
+        print("Process sampling requires '/proc', it will be disabled.", flush=True)
+        return None
+
+    sampler = ProcessSampler(interval)
+    sampler.start()
+    return sampler
+
+
+# Returns the PID and parent PID of every process that descends from the given process.
+def _get_descendants(root_pid: int) -> List[Tuple[int, int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+
+        pid = int(entry)
+        ppid = _read_ppid(pid)
+        if ppid is not None:
+            children.setdefault(ppid, []).append(pid)
+
+    descendants: List[Tuple[int, int]] = []
+    pending = [root_pid]
+    while pending:
+        parent = pending.pop()
+        for child in children.get(parent, []):
+            descendants.append((child, parent))
+            pending.append(child)
+
+    return descendants
+
+
+def _read_stat_fields(pid: int) -> Union[List[str], None]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    # The process name is enclosed in parentheses and may contain spaces,
+    # the rest of the fields start after the last closing parenthesis.
+    return content[content.rfind(")") + 2:].split()
+
+
+def _read_ppid(pid: int) -> Union[int, None]:
+    fields = _read_stat_fields(pid)
+    return int(fields[1]) if fields else None
+
+
+# Returns the CPU time (user + system, in clock ticks), RSS (in pages) and start time (in clock ticks since boot) of the process.
+def _read_stat(pid: int) -> Union[Tuple[int, int, int], None]:
+    fields = _read_stat_fields(pid)
+    if not fields:
+        return None
+
+    # See proc(5), the fields here are offset by 3 because pid, comm and state are not included.
+    utime = int(fields[11])
+    stime = int(fields[12])
+    start_time = int(fields[19])
+    rss = int(fields[21])
+    return (utime + stime, rss, start_time)
+
+
+def _read_cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def _read_io(pid: int) -> Tuple[int, int]:
+    read_bytes = 0
+    write_bytes = 0
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                if key == "read_bytes":
+                    read_bytes = int(value)
+                elif key == "write_bytes":
+                    write_bytes = int(value)
+    except (OSError, ValueError):
+        # Reading I/O statistics may not be allowed in some environments (e.g.: containers).
+        pass
+
+    return (read_bytes, write_bytes)
+
+
+def _get_role(cmdline: str) -> str:
+    lowered = cmdline.lower()
+    for role, patterns in _roles:
+        if any(pattern.lower() in lowered for pattern in patterns):
+            return role
+
+    return "other"
+
+
+def _format_bytes(value: int) -> str:
+    return f"{value / (1024 * 1024):.0f} MiB"
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+
+import os
+import glob
+import json
+import fnmatch
+import hashlib
+from typing import List
+
+import tools
+
+
+# Names of the files that affect the result of the restore, anywhere in the repository.
+_input_file_patterns: List[str] = ["*.csproj", "*.sln", "*.slnx", "Directory.*.props", "Directory.*.targets"]
+
+# Files that affect the result of the restore, relative to the repository root.
+# Every MSBuild file in the 'eng' directory is included because they can add package references.
+_input_files: List[str] = [
+    os.path.join("eng", "**", "*.props"),
+    os.path.join("eng", "**", "*.targets"),
+    os.path.join("eng", "**", "*.proj"),
+    "NuGet.config",
+    "global.json",
+]
+
+# Directories that never contain restore inputs.
+_excluded_dirs: List[str] = [".git", ".dotnet", ".tools", "artifacts", "bin", "obj"]
+
+
+# Determines whether the restore can be skipped because none of its inputs changed
+# since the last successful restore with the same arguments.
+# The inputs hash must be computed with 'compute_inputs_hash' before building.
+def is_up_to_date(inputs_hash: str) -> bool:
+    try:
+        with open(_get_fingerprint_file()) as f:
+            saved = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+
+    # The built-in tasks are built as part of the restore, so it can't be skipped without them.
+    if not glob.glob(os.path.join(tools.toolset_dir, "Common", tools.configuration, "*", "Tasks.dll")):
+        return False
+
+    # The NuGet package folders may have been cleared since the last restore.
+    if not all(os.path.isdir(package_folder) for package_folder in saved.get("package_folders", [])):
+        return False
+
+    return saved.get("fingerprint") == compute_fingerprint(inputs_hash)
+
+
+# Stores the fingerprint of the restore inputs after a successful restore.
+# The inputs hash must be the one computed before building, so files modified
+# during the build (e.g.: by an IDE) are not recorded as restored.
+def save(inputs_hash: str) -> None:
+    data = {
+        "fingerprint": compute_fingerprint(inputs_hash),
+        "package_folders": _get_package_folders(),
+    }
+
+    fingerprint_file = _get_fingerprint_file()
+    temp_file = f"{fingerprint_file}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_file, fingerprint_file)
+
+
+# Computes a hash of the source inputs of the restore: project files, MSBuild files that can add
+# package references, NuGet and SDK configuration, and the built-in tasks.
+def compute_inputs_hash(args: List[str]) -> str:
+    sha = hashlib.sha256()
+    sha.update(json.dumps([tools.configuration, args]).encode("utf-8"))
+
+    for path in _get_input_files():
+        sha.update(os.path.relpath(path, tools.repo_root).encode("utf-8"))
+        sha.update(_hash_file(path))
+
+    return sha.hexdigest()
+
+
+# Computes the fingerprint of the restore from the hash of its source inputs
+# and the assets files produced by the last restore.
+def compute_fingerprint(inputs_hash: str) -> str:
+    sha = hashlib.sha256()
+    sha.update(inputs_hash.encode("utf-8"))
+
+    # Assets files are large, use their size and timestamp instead of their contents.
+    for path in _get_assets_files():
+        st = os.stat(path)
+        sha.update(f"{os.path.relpath(path, tools.repo_root)}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+
+    return sha.hexdigest()
+
+
+def _get_fingerprint_file() -> str:
+    return os.path.join(tools.toolset_dir, f"restore.{tools.configuration}.fingerprint.json")
+
+
+def _get_input_files() -> List[str]:
+    files = []
+    for pattern in _input_files:
+        files += glob.glob(os.path.join(tools.repo_root, pattern), recursive=True)
+
+    for dir_path, dir_names, file_names in os.walk(tools.repo_root):
+        dir_names[:] = sorted(name for name in dir_names if name not in _excluded_dirs)
+
+        for file_name in file_names:
+            if any(fnmatch.fnmatch(file_name, pattern) for pattern in _input_file_patterns):
+                files.append(os.path.join(dir_path, file_name))
+
+    # The built-in tasks project is built during the restore.
+    files += glob.glob(os.path.join(tools.eng_root, "common", "tasks", "*.cs"))
+
+    return sorted(set(path for path in files if os.path.isfile(path)))
+
+
+def _get_assets_files() -> List[str]:
+    assets_files = glob.glob(os.path.join(tools.artifacts_dir, "obj", "**", "project.assets.json"), recursive=True)
+    assets_files += glob.glob(os.path.join(tools.toolset_dir, "**", "project.assets.json"), recursive=True)
+
+    # Consumer validation restores the samples against the local packages in its own directory,
+    # that shouldn't invalidate the restore of the repository.
+    consumer_validation_dir = os.path.join(tools.artifacts_dir, "obj", "ConsumerValidation")
+    return sorted(path for path in assets_files if not path.startswith(consumer_validation_dir + os.sep))
+
+
+def _get_package_folders() -> List[str]:
+    package_folders = set()
+    for path in _get_assets_files():
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                package_folders.update(json.load(f).get("packageFolders", {}).keys())
+        except (OSError, json.JSONDecodeError):
+            continue
+
+    return sorted(package_folders)
+
+
+def _hash_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
@@ -32,6 +32,9 @@ binary_log: bool = False
 # True to restore toolsets and dependencies.
 restore: bool = True
 
+# True to restore even if the restore inputs haven't changed since the last successful restore.
+force_restore: bool = False
+
 # True to build the projects.
 build: bool = False
 
@@ -41,6 +44,54 @@ rebuild: bool = False
 # True to run the test projects.
 test: bool = False
 
+# True to run the integration test projects.
+integration_test: bool = False
+
+# True to run the performance test projects and compare their results with the baseline.
+performance_test: bool = False
+
+# Path to the JSON file that contains the performance baseline.
+performance_baseline: str = ""
+
+# Maximum allowed increase (in percent) of the mean execution time of a benchmark compared to the baseline.
+performance_threshold: float = 10.0
+
+# Maximum allowed increase (in percent) of the allocated bytes per operation of a benchmark compared to the baseline.
+performance_allocation_threshold: float = 10.0
+
+# True to report performance regressions as warnings instead of failing the build.
+performance_warn_only: bool = False
+
+# True to replace the performance baseline with the results of the current run.
+update_performance_baseline: bool = False
+
+# True to build the consumer projects in the 'samples' directory against the packages produced by the build.
+validate_consumers: bool = False
+
+# Maximum number of consumer projects built at the same time, all of them if unspecified.
+consumer_jobs: Union[int, None] = None
+
+# Directory to search for Godot projects to run the upgrade assistant over.
+upgrade_projects_root: Union[str, None] = None
+
+# Upgrade assistant command to run over the Godot projects: 'analyze' or 'upgrade'.
+upgrade_mode: str = "analyze"
+
+# Godot version to upgrade the Godot projects to, the latest version known by the upgrade assistant if unspecified.
+upgrade_target_godot_version: Union[str, None] = None
+
+# True to enable the Godot .NET bindings preview when running the upgrade assistant.
+upgrade_enable_preview: bool = False
+
+# Maximum number of upgrade assistant processes running at the same time.
+upgrade_jobs: int = 4
+
+# True to sample the resource usage of the child processes (MSBuild nodes, compiler server, test hosts) during the build.
+sample_processes: bool = False
+
+# Interval between process samples, in seconds.
+sample_interval: float = 1.0
+
 # True to package build outputs into NuGet packages.
 pack: bool = False
 
@@ -89,12 +140,13 @@ toolset_dir: str
 tools_dir: str
 log_dir: str
 temp_dir: str
+test_results_dir: str
 
 global_json: Namespace
 
 
 def init(args: Namespace) -> None:
-    global projects, ci, configuration, exclude_ci_binary_log, binary_log, restore, build, rebuild, test, pack, publish, clean, verbosity, node_reuse, warn_as_error, msbuild_engine, use_global_nuget_cache, exclude_prerelease_vs, product_build, push_nupkgs_local, repo_root, eng_root, artifacts_dir, toolset_dir, tools_dir, log_dir, temp_dir, global_json
+    global projects, ci, configuration, exclude_ci_binary_log, binary_log, restore, force_restore, build, rebuild, test, integration_test, performance_test, performance_baseline, performance_threshold, performance_allocation_threshold, performance_warn_only, update_performance_baseline, validate_consumers, consumer_jobs, upgrade_projects_root, upgrade_mode, upgrade_target_godot_version, upgrade_enable_preview, upgrade_jobs, sample_processes, sample_interval, pack, publish, clean, verbosity, node_reuse, warn_as_error, msbuild_engine, use_global_nuget_cache, exclude_prerelease_vs, product_build, push_nupkgs_local, repo_root, eng_root, artifacts_dir, toolset_dir, tools_dir, log_dir, temp_dir, test_results_dir, global_json
 
     # Initialize variables if they aren't already defined.
     projects = args.projects.split(";") if args.projects else []
@@ -103,9 +155,25 @@ def init(args: Namespace) -> None:
     exclude_ci_binary_log = _get_value_or_default(args.excludeCIBinarylog, False)
     binary_log = _get_value_or_default(args.binaryLog, ci and not exclude_ci_binary_log)
     restore = _get_value_or_default(args.restore, True)
+    force_restore = _get_value_or_default(args.forceRestore, False)
     build = _get_value_or_default(args.build, False)
     rebuild = _get_value_or_default(args.rebuild, False)
     test = _get_value_or_default(args.test, False)
+    integration_test = _get_value_or_default(args.integrationTest, False)
+    performance_test = _get_value_or_default(args.performanceTest, False)
+    performance_threshold = _get_value_or_default(args.performanceThreshold, 10.0)
+    performance_allocation_threshold = _get_value_or_default(args.performanceAllocationThreshold, 10.0)
+    performance_warn_only = _get_value_or_default(args.performanceWarnOnly, False)
+    update_performance_baseline = _get_value_or_default(args.updatePerformanceBaseline, False)
+    validate_consumers = _get_value_or_default(args.validateConsumers, False)
+    consumer_jobs = _get_value_or_default(args.consumerJobs, None)
+    upgrade_projects_root = os.path.abspath(args.upgradeProjects) if args.upgradeProjects else None
+    upgrade_mode = _get_value_or_default(args.upgradeMode, "analyze")
+    upgrade_target_godot_version = _get_value_or_default(args.upgradeTargetGodotVersion, None)
+    upgrade_enable_preview = _get_value_or_default(args.upgradeEnablePreview, False)
+    upgrade_jobs = max(1, _get_value_or_default(args.upgradeJobs, min(4, os.cpu_count() or 1)))
+    sample_processes = _get_value_or_default(args.sampleProcesses, False)
+    sample_interval = _get_value_or_default(args.sampleInterval, 1.0)
     pack = _get_value_or_default(args.pack, False)
     publish = _get_value_or_default(args.publish, False)
     clean = _get_value_or_default(args.clean, False)
@@ -119,6 +187,10 @@ def init(args: Namespace) -> None:
         msbuild_engine = _get_value_or_default(args.msbuildEngine, None)
         exclude_prerelease_vs = _get_value_or_default(args.excludePrereleaseVS, False)
 
+    if validate_consumers:
+        # Consumers are validated against the packages produced by a product build.
+        product_build = True
+
     if product_build:
         # A product build also implies build, restore, and pack.
         build = True
@@ -136,6 +208,11 @@ def init(args: Namespace) -> None:
         # Ensure the path is absolute.
         push_nupkgs_local = os.path.abspath(push_nupkgs_local)
 
+    if performance_test:
+        # Benchmarks must run on optimized builds, so the default configuration should be 'Release'.
+        if not args.configuration:
+            configuration = "Release"
+
     # Initialize variables for common directories.
     script_dir = os.path.dirname(__file__)
     repo_root = os.path.abspath(os.path.join(script_dir, os.pardir, os.pardir)) + os.path.sep
@@ -145,6 +222,9 @@ def init(args: Namespace) -> None:
     tools_dir = os.path.join(repo_root, ".tools")
     log_dir = os.path.join(artifacts_dir, "log", configuration)
     temp_dir = os.path.join(artifacts_dir, "tmp", configuration)
+    test_results_dir = os.path.join(artifacts_dir, "TestResults", configuration)
+
+    performance_baseline = os.path.abspath(args.performanceBaseline) if args.performanceBaseline else os.path.join(eng_root, "PerformanceBaseline.json")
 
     # HOME may not be defined in some scenarios, but it is required by NuGet.
     if not os.getenv("HOME"):
@@ -483,3 +563,9 @@ def msbuild(args: List[str]) -> None:
 def pipeline_write_error(title: str, value: str):
     if ci:
         print(f"::error title={title}::{value}", flush=True)
+
+
+# Print a warning in GitHub Actions pipeline.
+def pipeline_write_warning(title: str, value: str):
+    if ci:
+        print(f"::warning title={title}::{value}", flush=True)
@@ -0,0 +1,378 @@
+#!/usr/bin/python3
+
+import os
+import re
+import glob
+import json
+import time
+import html
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Union
+
+import tools
+
+
+# Files that affect the results of the upgrade assistant, relative to the Godot project directory.
+_input_patterns: List[str] = [
+    "project.godot",
+    "**/*.cs",
+    "**/*.csproj",
+    "**/*.sln",
+    "**/*.slnx",
+    "**/Directory.*.props",
+    "**/Directory.*.targets",
+    "**/global.json",
+    "**/NuGet.config",
+]
+
+# Directories that never contain inputs of the upgrade assistant.
+_excluded_dirs: List[str] = [".godot", ".mono", "bin", "obj"]
+
+
+class GodotProject:
+    godot_project: str
+    dotnet_solution: Union[str, None]
+    dotnet_project: Union[str, None]
+
+    def __init__(self, godot_project: str, dotnet_solution: Union[str, None], dotnet_project: Union[str, None]):
+        self.godot_project = godot_project
+        self.dotnet_solution = dotnet_solution
+        self.dotnet_project = dotnet_project
+
+    @property
+    def directory(self) -> str:
+        return os.path.dirname(self.godot_project)
+
+
+class ProjectResult:
+    godot_project: str
+    status: str
+    exit_code: Union[int, None]
+    duration: float
+    summary: Union[str, None]
+    log: Union[str, None]
+    message: str
+
+    def __init__(self, godot_project: str, status: str, exit_code: Union[int, None] = None, duration: float = 0.0, summary: Union[str, None] = None, log: Union[str, None] = None, message: str = ""):
+        self.godot_project = godot_project
+        self.status = status
+        self.exit_code = exit_code
+        self.duration = duration
+        self.summary = summary
+        self.log = log
+        self.message = message
+
+    def to_json(self) -> dict:
+        return {
+            "godot_project": self.godot_project,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "duration": round(self.duration, 3),
+            "summary": self.summary,
+            "log": self.log,
+            "message": self.message,
+        }
+
+    @staticmethod
+    def from_json(data: dict) -> "ProjectResult":
+        return ProjectResult(data["godot_project"], data["status"], data.get("exit_code"), data.get("duration", 0.0), data.get("summary"), data.get("log"), data.get("message", ""))
+
+
+# Runs the upgrade assistant over every Godot project found under the root directory.
+# The projects are processed in parallel, with at most 'tools.upgrade_jobs' assistant processes
+# running at the same time. Projects whose inputs haven't changed since the last successful run
+# for the same target Godot version are skipped and their previous results are reused.
+# Terminates the script if the assistant failed for any project.
+def run_batch(cli_dll: str) -> None:
+    root = tools.upgrade_projects_root
+    projects = discover_projects(root)
+    if not projects:
+        print(f"No Godot projects found in '{root}'.", flush=True)
+        return
+
+    target_version = tools.upgrade_target_godot_version or "latest"
+    output_dir = os.path.join(tools.artifacts_dir, "UpgradeAssistant", f"{tools.upgrade_mode}-{target_version}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    cache_file = os.path.join(output_dir, "cache.json")
+    cache = _read_cache(cache_file)
+    tool_hash = _get_tool_hash(cli_dll)
+
+    print(f"Running the upgrade assistant ({tools.upgrade_mode}) over {len(projects)} Godot projects with {tools.upgrade_jobs} jobs.", flush=True)
+
+    def process(project: GodotProject) -> ProjectResult:
+        project_output_dir = os.path.join(output_dir, _get_output_name(root, project))
+
+        fingerprint = _get_fingerprint(project, tool_hash)
+        cached = cache.get(project.godot_project)
+        if cached and cached["fingerprint"] == fingerprint:
+            result = ProjectResult.from_json(cached["result"])
+            result.status = "cached"
+            result.duration = 0.0
+            return result
+
+        result = _run_assistant(cli_dll, project, project_output_dir)
+        if result.status == "succeeded":
+            # Compute the fingerprint after running because 'upgrade' modifies the project.
+            cache[project.godot_project] = {
+                "fingerprint": _get_fingerprint(project, tool_hash),
+                "result": result.to_json(),
+            }
+        else:
+            cache.pop(project.godot_project, None)
+
+        return result
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=tools.upgrade_jobs) as executor:
+        results = list(executor.map(process, projects))
+    duration = time.monotonic() - start
+
+    _write_cache(cache_file, cache)
+
+    report_file = os.path.join(output_dir, "report.json")
+    _write_report(report_file, results, duration)
+    _write_html_report(os.path.join(output_dir, "report.html"), results, duration)
+
+    failed = [result for result in results if result.status == "failed"]
+    for result in results:
+        print(f"  [{result.status}] {result.godot_project} ({result.duration:.1f}s){' - ' + result.message if result.message else ''}", flush=True)
+
+    counts = {status: len([result for result in results if result.status == status]) for status in ["succeeded", "cached", "skipped", "failed"]}
+    print(f"Upgrade assistant finished in {duration:.1f}s: {counts['succeeded']} succeeded, {counts['cached']} cached, {counts['skipped']} skipped, {counts['failed']} failed.", flush=True)
+    print(f"Report written to '{report_file}'.", flush=True)
+
+    if failed:
+        for result in failed:
+            tools.pipeline_write_error("UpgradeAssistant", f"{result.godot_project}: {result.message}")
+        exit(1)
+
+
+# Finds the Godot projects under the root directory and the .NET solution and project
+# that the upgrade assistant should use for each of them.
+def discover_projects(root: str) -> List[GodotProject]:
+    projects: List[GodotProject] = []
+
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = sorted(name for name in dir_names if name not in _excluded_dirs and not name.startswith("."))
+
+        if "project.godot" not in file_names:
+            continue
+
+        godot_project = os.path.join(dir_path, "project.godot")
+        assembly_name = _get_assembly_name(godot_project)
+
+        dotnet_solution = _find_file(dir_path, ["*.sln", "*.slnx"], assembly_name)
+        dotnet_project = _find_file(dir_path, ["*.csproj"], assembly_name)
+        projects.append(GodotProject(godot_project, dotnet_solution, dotnet_project))
+
+    return projects
+
+
+# Reads the 'dotnet/project/assembly_name' setting from the Godot project file, Godot uses it
+# to name the .NET solution and project.
+def _get_assembly_name(godot_project: str) -> Union[str, None]:
+    section = ""
+    with open(godot_project, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1]
+            elif section == "dotnet" and line.startswith("project/assembly_name="):
+                return line.split("=", 1)[1].strip().strip('"')
+
+    return None
+
+
+def _find_file(directory: str, patterns: List[str], preferred_name: Union[str, None]) -> Union[str, None]:
+    candidates: List[str] = []
+    for pattern in patterns:
+        candidates += sorted(glob.glob(os.path.join(directory, pattern)))
+
+    if preferred_name:
+        for candidate in candidates:
+            if os.path.splitext(os.path.basename(candidate))[0] == preferred_name:
+                return candidate
+
+    # Without the assembly name, only use the file if it's unambiguous.
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _run_assistant(cli_dll: str, project: GodotProject, output_dir: str) -> ProjectResult:
+    if not project.dotnet_solution or not project.dotnet_project:
+        return ProjectResult(project.godot_project, "skipped", message="Unable to find the .NET solution and project.")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    summary_file = os.path.join(output_dir, "summary.html")
+    log_file = os.path.join(output_dir, "upgrade-assistant.log")
+
+    args = [
+        tools.upgrade_mode,
+        project.godot_project,
+        "--solution", project.dotnet_solution,
+        "--project", project.dotnet_project,
+        "--output", summary_file,
+    ]
+    if tools.upgrade_target_godot_version:
+        args += ["--target-godot-version", tools.upgrade_target_godot_version]
+    if tools.upgrade_enable_preview:
+        args.append("--enable-preview")
+
+    start = time.monotonic()
+    with open(log_file, "w") as log:
+        # Use the output directory as the working directory so the log files
+        # written by each assistant process don't collide.
+        exit_code = subprocess.call(["dotnet", "exec", cli_dll, *args], cwd=output_dir, stdout=log, stderr=subprocess.STDOUT)
+    duration = time.monotonic() - start
+
+    if exit_code != 0:
+        return ProjectResult(project.godot_project, "failed", exit_code, duration, None, log_file, f"Exited with code {exit_code}, see '{log_file}'.")
+
+    summary = summary_file if os.path.exists(summary_file) else None
+    return ProjectResult(project.godot_project, "succeeded", exit_code, duration, summary, log_file)
+
+
+# Returns a readable name for the output directory of the project. Different paths can be sanitized
+# to the same name (e.g.: 'foo/bar' and 'foo_bar'), so a short hash of the path is appended.
+def _get_output_name(root: str, project: GodotProject) -> str:
+    relative_path = os.path.relpath(project.directory, root)
+    if relative_path == os.curdir:
+        relative_path = os.path.basename(os.path.abspath(root))
+    path_hash = hashlib.sha256(relative_path.replace(os.sep, "/").encode("utf-8")).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', relative_path)}-{path_hash}"
+
+
+# Computes a hash of the inputs of the upgrade assistant for the given project, including
+# the assistant itself and the options that affect the results.
+def _get_fingerprint(project: GodotProject, tool_hash: str) -> str:
+    sha = hashlib.sha256()
+    sha.update(json.dumps([
+        tool_hash,
+        tools.upgrade_mode,
+        tools.upgrade_target_godot_version,
+        tools.upgrade_enable_preview,
+        project.dotnet_solution,
+        project.dotnet_project,
+    ]).encode("utf-8"))
+
+    for path in _get_input_files(project.directory):
+        sha.update(os.path.relpath(path, project.directory).encode("utf-8"))
+        sha.update(_hash_file(path).encode("utf-8"))
+
+    return sha.hexdigest()
+
+
+# Computes a hash of the upgrade assistant and every assembly it loads. The analysis and upgrade logic lives
+# in referenced assemblies, and the build is deterministic, so the CLI assembly alone may not change.
+def _get_tool_hash(cli_dll: str) -> str:
+    tool_dir = os.path.dirname(cli_dll)
+    files = glob.glob(os.path.join(tool_dir, "**", "*.dll"), recursive=True)
+    files += glob.glob(os.path.join(tool_dir, "*.deps.json"))
+    files += glob.glob(os.path.join(tool_dir, "*.runtimeconfig.json"))
+
+    sha = hashlib.sha256()
+    for path in sorted(files):
+        sha.update(os.path.relpath(path, tool_dir).encode("utf-8"))
+        sha.update(_hash_file(path).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _get_input_files(directory: str) -> List[str]:
+    files = set()
+    for pattern in _input_patterns:
+        for path in glob.glob(os.path.join(directory, pattern), recursive=True):
+            relative_parts = os.path.relpath(path, directory).split(os.sep)
+            if any(part in _excluded_dirs for part in relative_parts[:-1]):
+                continue
+            files.add(path)
+
+    return sorted(files)
+
+
+def _hash_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _read_cache(cache_file: str) -> Dict[str, dict]:
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_cache(cache_file: str, cache: Dict[str, dict]) -> None:
+    temp_file = f"{cache_file}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(temp_file, cache_file)
+
+
+def _write_report(report_file: str, results: List[ProjectResult], duration: float) -> None:
+    data = {
+        "mode": tools.upgrade_mode,
+        "target_godot_version": tools.upgrade_target_godot_version,
+        "root": tools.upgrade_projects_root,
+        "duration": round(duration, 3),
+        "projects": [result.to_json() for result in results],
+    }
+
+    with open(report_file, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _write_html_report(report_file: str, results: List[ProjectResult], duration: float) -> None:
+    rows = []
+    for result in results:
+        summary = f'<a href="{html.escape(_to_relative_url(report_file, result.summary))}">summary</a>' if result.summary else ""
+        log = f'<a href="{html.escape(_to_relative_url(report_file, result.log))}">log</a>' if result.log else ""
+        rows.append(f"""      <tr class="{result.status}">
+        <td>{html.escape(result.godot_project)}</td>
+        <td>{result.status}</td>
+        <td class="numeric">{result.duration:.1f}s</td>
+        <td>{summary} {log}</td>
+        <td>{html.escape(result.message)}</td>
+      </tr>""")
+
+    target_version = html.escape(tools.upgrade_target_godot_version or "latest")
+    rows_str = "\n".join(rows)
+    content = f"""<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8">
+    <title>Godot .NET upgrade assistant report</title>
+    <style>
+      body {{ font-family: sans-serif; }}
+      table {{ border-collapse: collapse; }}
+      td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+      .numeric {{ text-align: right; }}
+      .failed {{ background-color: #fdd; }}
+      .skipped {{ color: #888; }}
+    </style>
+  </head>
+  <body>
+    <h1>Godot .NET upgrade assistant report</h1>
+    <p>Mode: {tools.upgrade_mode}, target Godot version: {target_version}, duration: {duration:.1f}s</p>
+    <table>
+      <tr><th>Project</th><th>Status</th><th>Duration</th><th>Results</th><th>Message</th></tr>
+{rows_str}
+    </table>
+  </body>
+</html>
+"""
+
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _to_relative_url(report_file: str, path: str) -> str:
+    return os.path.relpath(path, os.path.dirname(report_file)).replace(os.sep, "/")